@@ -1,15 +1,16 @@
 """FastAPI application factory."""
 
 import os
-import json
-from fastapi import FastAPI, Request
+import msgspec
+from fastapi import BackgroundTasks, FastAPI, Request
 from telegram import Update
 from telegram.ext import Application, CallbackQueryHandler
+from telegram.request import HTTPXRequest
 from dotenv import load_dotenv
 
 from utils.logging import get_logger
 from telegram_bot.callback import handle_callback
-from database.client import get_supabase_client
+from database.pool import create_pg_pool
 
 logger = get_logger(__name__)
 load_dotenv()
@@ -19,13 +20,13 @@ WEBHOOK_PATH = "/telegram/webhook"
 
 app = FastAPI()
 
-# Create python tele bot application
-news_app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
-
-# Initialize supabase client
-supabase = get_supabase_client()
-
-news_app.bot_data["supabase"] = supabase
+# Create python tele bot application, replies share one keep-alive HTTP/2 connection pool
+news_app = (
+    Application.builder()
+    .token(TELEGRAM_BOT_TOKEN)
+    .request(HTTPXRequest(connection_pool_size=20, http_version="2"))
+    .build()
+)
 
 # Register handlers
 news_app.add_handler(CallbackQueryHandler(handle_callback))
@@ -33,6 +34,10 @@ news_app.add_handler(CallbackQueryHandler(handle_callback))
 
 @app.on_event("startup")
 async def startup_event():
+    # Create the Postgres connection pool shared by the app and all handlers
+    app.state.pg = await create_pg_pool(min_size=2, max_size=10)
+    news_app.bot_data["pg"] = app.state.pg
+
     # Initialize and start the telegram Application so it can process updates from the queue
     await news_app.initialize()
     await news_app.bot.initialize()
@@ -46,6 +51,7 @@ async def shutdown_event():
     # Stop and shutdown the telegram Application gracefully
     await news_app.stop()
     await news_app.shutdown()
+    await app.state.pg.close()
 
     logger.info("Telegram Application stopped")
 
@@ -62,7 +68,7 @@ async def webhook_get():
 
 
 @app.post(WEBHOOK_PATH)
-async def telegram_webhook(req: Request):
+async def telegram_webhook(req: Request, background_tasks: BackgroundTasks):
 
     body_bytes = await req.body()
     client_ip = req.client.host if req.client else "unknown"
@@ -73,8 +79,8 @@ async def telegram_webhook(req: Request):
         return {"ok": True}
 
     try:
-        data = json.loads(body_bytes)
-    except json.JSONDecodeError:
+        data = msgspec.json.decode(body_bytes)
+    except msgspec.DecodeError:
         # Not JSON or empty body
         return {"ok": True}
 
@@ -84,5 +90,6 @@ async def telegram_webhook(req: Request):
         # Invalid or unsupported Tele payload
         return {"ok": True}
 
-    await news_app.process_update(update)
+    # Ack Telegram right away, the update is processed after the response is sent
+    background_tasks.add_task(news_app.process_update, update)
     return {"ok": True} 
\ No newline at end of file
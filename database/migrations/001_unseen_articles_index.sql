@@ -0,0 +1,4 @@
+-- Partial index backing the recommendation candidate scan in recommend.py
+CREATE INDEX IF NOT EXISTS deutsch_unseen_articles_idx
+    ON deutsch (topic)
+    WHERE active AND feedback IS NULL AND recommended_at IS NULL;
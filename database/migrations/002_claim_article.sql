@@ -0,0 +1,18 @@
+-- Atomically move the oldest article in `from_status` to `to_status`.
+-- SKIP LOCKED lets concurrent workers claim different rows without waiting.
+CREATE OR REPLACE FUNCTION claim_article(from_status text, to_status text)
+RETURNS SETOF deutsch
+LANGUAGE sql
+AS $$
+    UPDATE deutsch
+    SET status = to_status
+    WHERE id = (
+        SELECT id
+        FROM deutsch
+        WHERE status = from_status
+        ORDER BY id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING *;
+$$;
@@ -0,0 +1,14 @@
+-- Store feedback_at as timestamptz so asyncpg returns timezone-aware datetimes.
+-- Existing values without a timezone were written in UTC.
+DO $$
+BEGIN
+    IF (
+        SELECT data_type
+        FROM information_schema.columns
+        WHERE table_name = 'deutsch' AND column_name = 'feedback_at'
+    ) <> 'timestamp with time zone' THEN
+        ALTER TABLE deutsch
+            ALTER COLUMN feedback_at TYPE timestamptz
+            USING feedback_at::timestamp AT TIME ZONE 'UTC';
+    END IF;
+END $$;
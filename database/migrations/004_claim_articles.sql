@@ -0,0 +1,18 @@
+-- Atomically move up to `n` of the oldest articles in `from_status` to `to_status`.
+-- SKIP LOCKED lets concurrent workers claim disjoint batches without waiting.
+CREATE OR REPLACE FUNCTION claim_articles(n int, from_status text, to_status text)
+RETURNS SETOF deutsch
+LANGUAGE sql
+AS $$
+    UPDATE deutsch
+    SET status = to_status
+    WHERE id IN (
+        SELECT id
+        FROM deutsch
+        WHERE status = from_status
+        ORDER BY id
+        LIMIT n
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING *;
+$$;
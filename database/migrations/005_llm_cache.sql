@@ -0,0 +1,24 @@
+-- Validated LLM outputs keyed by SHA-256 of (model, output type, prompt version,
+-- whitespace-normalized prompt). Cached per call rather than per article, so a
+-- translation survives a failed classification in the two-step pipeline.
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key text PRIMARY KEY,
+    output jsonb NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- Daily cleanup of entries past the 30 day TTL, only where pg_cron is installed.
+-- Without it the table still works, expired rows are just never deleted.
+DO $do$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule(
+            'llm-cache-cleanup',
+            '0 3 * * *',
+            $$DELETE FROM llm_cache WHERE created_at < now() - interval '30 days'$$
+        );
+    ELSE
+        RAISE NOTICE 'pg_cron is not installed, llm_cache cleanup not scheduled';
+    END IF;
+END
+$do$;
@@ -0,0 +1,22 @@
+"""Initialize asyncpg connection pool."""
+
+import os
+import asyncpg
+from dotenv import load_dotenv
+
+load_dotenv()
+
+async def create_pg_pool(min_size: int = 2, max_size: int = 10) -> asyncpg.Pool:
+    supabase_db_url = os.getenv("SUPABASE_DB_URL")
+
+    if not supabase_db_url:
+        raise RuntimeError("SUPABASE_DB_URL missing!")
+
+    return await asyncpg.create_pool(
+        supabase_db_url,
+        min_size=min_size,
+        max_size=max_size,
+        # Supavisor's transaction mode (needed from IPv4-only CI runners)
+        # does not support prepared statements across transactions
+        statement_cache_size=0,
+    )
@@ -1,5 +1,8 @@
 """Prompts for translation and classification."""
 
+# Bump whenever a prompt below changes, so cached LLM outputs are not reused
+PROMPT_VERSION = "1"
+
 TRANSLATOR_AGENT_PROMPT = """
     You are a professional news translator and editor.
 
@@ -20,7 +23,18 @@ TRANSLATOR_AGENT_PROMPT = """
         2. A succinct English summary (2-3 sentences)
     """
 
-TRANSLATOR_PROMPT = """
+
+def translator_prompt(title_de: str, content_de: str) -> str:
+    """Build the user prompt of a German article to translate.
+
+    Args:
+        title_de: Original German article title.
+        content_de: Original German article content.
+
+    Returns:
+        The user prompt containing the German title and article.
+    """
+    return f"""
     German title:
     {title_de}
 
@@ -28,6 +42,7 @@ TRANSLATOR_PROMPT = """
     {content_de}
     """
 
+
 CLASSIFICATION_AGENT_PROMPT = """
     You are a news classification assistant.
 
@@ -49,10 +64,55 @@ CLASSIFICATION_AGENT_PROMPT = """
     - Return JSON only
     """
 
-CLASSIFICATION_PROMPT = """
+
+def classification_prompt(title_en: str, content_en: str) -> str:
+    """Build the user prompt of a translated article to classify.
+
+    Args:
+        title_en: Translated English article title.
+        content_en: Translated English article content.
+
+    Returns:
+        The user prompt containing the English title and article.
+    """
+    return f"""
     English title:
     {title_en}
 
     English article:
     {content_en}
-    """
\ No newline at end of file
+    """
+
+
+COMBINED_AGENT_PROMPT = """
+    You are a professional news translator, editor and classification assistant.
+
+    You MUST return a JSON object that matches this schema exactly:
+    {
+        "title_en": string,
+        "content_en": string,
+        "summary_en": string,
+        "topic": string,
+        "sentiment": string,
+        "urgency": string
+    }
+
+    Translation rules:
+    - Translate German news articles into clear, neutral English
+    - Prefer short, clear sentences
+    - Preserve factual meaning and tone
+    - Do not add opinions or commentary
+    - Provide:
+        1. Full English Translation of the article
+        2. A succinct English summary (2-3 sentences)
+
+    Classification rules:
+    - Topic must be ONE of:
+        Politics, Economy, Society, Technology, Health, Environment, Sports, Other
+    - Sentiment must be ONE of:
+        Positive, Neutral, Negative
+    - Urgency must be ONE of:
+        Breaking, Normal, Low
+    - Base your decision ONLY on the article content
+    - Return JSON only
+    """
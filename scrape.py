@@ -1,26 +1,39 @@
 """Script to scrape articles from Tagesschau."""
 
+import re
 import random
-from datetime import datetime, timezone
-from typing import Optional, Dict, Any, Tuple
+import asyncio
+from datetime import date, datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple
 
-from pydantic import ValidationError
-from playwright.sync_api import sync_playwright
+import asyncpg
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 
 from utils.logging import get_logger
-from database.client import get_supabase_client
+from database.pool import create_pg_pool
 
 logger = get_logger(__name__)
-supabase = get_supabase_client()
 
+TAGESSCHAU_URL = "https://www.tagesschau.de"
+SCRAPE_WORKERS = 8
+STAND_DATE_PATTERN = re.compile(r"Stand:\s*(\d{2}\.\d{2}\.\d{4})")
 
-def add_new_article() -> Optional[Dict[str, Any]]:
+
+async def add_new_article(
+    client: httpx.AsyncClient,
+    pool: asyncpg.Pool,
+    ) -> Optional[Dict[str, Any]]:
     """Scrapes Tagesschau for a new article and insert into the database.
     
     Steps:
     1. Randomly selects a news category from Tagesschau navigation bar
-    2. Scrapes article links from category page using Playwright
+    2. Scrapes article links from category page using httpx and selectolax
     3. Insert an article into the Supabase db without duplication (using 'article_url' field)
+
+    Args:
+        client: Shared httpx client used to fetch Tagesschau pages.
+        pool: asyncpg connection pool used to query the database.
     
     Returns:
         - A database row representating the newly inserted article if found OR
@@ -37,208 +50,270 @@ def add_new_article() -> Optional[Dict[str, Any]]:
     selected_category = random.choice(category_list)
     logger.info(f"Selected category: {selected_category}")
 
-    with sync_playwright() as p:
-            logger.info("Launching browser...")
-
-            browser = p.chromium.launch(headless=True) 
-            page = browser.new_page()
-
-            # Homepage
-            page.goto("https://www.tagesschau.de")
-
-            # Click category in nav bar (visible only)
-            page.click(f"nav a:has-text('{selected_category}'):visible")
-            page.wait_for_timeout(2000)
-
-            # Get all article links
-            article_links = page.locator("main a[href*='-100.html']")
-            count = article_links.count()
+    # Homepage
+    response = await client.get("/")
+    response.raise_for_status()
+    homepage = LexborHTMLParser(response.text)
+
+    # Find category in nav bar
+    category_href = next(
+        (
+            link.attributes.get("href")
+            for link in homepage.css("nav a")
+            if selected_category in link.text(strip=True)
+            and link.attributes.get("href")
+        ),
+        None,
+    )
 
-            if count == 0:
-                browser.close()
-                raise RuntimeError("No article links found.")
+    if category_href is None:
+        raise RuntimeError(f"Category {selected_category} not found in nav bar.")
 
-            logger.info(f"Found {count} article links.")
+    response = await client.get(category_href)
+    response.raise_for_status()
+    category_page = LexborHTMLParser(response.text)
 
-            seen = set()
+    # Get all article links, deduplicated in page order
+    hrefs = dict.fromkeys(filter(None, (
+        link.attributes.get("href")
+        for link in category_page.css("main a[href*='-100.html']")
+    )))
 
-            for i in range(count):
-                href = article_links.nth(i).get_attribute("href")
+    if not hrefs:
+        raise RuntimeError("No article links found.")
 
-                if not href:
-                    continue
+    logger.info(f"Found {len(hrefs)} article links.")
 
-                # Avoid duplicates in the same page
-                if href in seen:
-                    continue
-                seen.add(href)
+    article_urls = [f"{TAGESSCHAU_URL}{href}" for href in hrefs]
 
-                article_url = f"https://www.tagesschau.de{href}"
-                logger.info(f"Trying article: {article_url}")
+    async with pool.acquire() as conn:
+        # Filter out already known articles in one query
+        known = {
+            row["article_url"]
+            for row in await conn.fetch(
+                "SELECT article_url FROM deutsch WHERE article_url = ANY($1::text[])",
+                article_urls,
+            )
+        }
 
-                response = supabase.table("deutsch").upsert({
-                    "article_url": article_url,
-                    "category": selected_category,
-                    },
-                    on_conflict="article_url"
-                ).execute()
+        fresh = [url for url in article_urls if url not in known]
+        if not fresh:
+            logger.info("No new articles found in this category.")
+            return None
 
-                row = response.data[0]
-                if row["status"] == "new":
-                    logger.info(f"New article added: {article_url}")
-                    browser.close()
-                    return row
+        article_url = fresh[0]
+        row = await conn.fetchrow(
+            "INSERT INTO deutsch (article_url, category) VALUES ($1, $2) "
+            "ON CONFLICT (article_url) DO NOTHING RETURNING *",
+            article_url,
+            selected_category,
+        )
 
-                logger.info("Article already exists, trying next...")
+    if row is None:
+        logger.info(f"Article was added concurrently: {article_url}")
+        return None
 
-            browser.close()
-            logger.info("No new articles found in this category.")
-            return None
+    logger.info(f"New article added: {article_url}")
+    return dict(row)
 
 
-def scrape_article(url: str) -> Tuple[str, str, Optional[str]]:
+async def scrape_article(
+    client: httpx.AsyncClient,
+    url: str,
+    ) -> Tuple[str, str, date]:
     """Scrapes and article page and extract its title, content and published date.
     
     Steps:
-    1. Uses Playwright to load the given article URL
+    1. Fetches the given article URL with httpx
     2. Extracts main title from first <h1> element
     3. Collects paragraph text from article body
     4. Parse the published date if available, otherwise use current time
 
     Args:
+        client: Shared httpx client used to fetch the article page.
         url: The article url to scrape.
     
     Returns:
         title: The article title text.
         content: The article body text.
-        published date: ISO-formatted publication date if found,
+        published date: The publication date if found,
             otherwise current date.
     """
     logger.info("Scrapping article...")
 
-    with sync_playwright() as p:
-            logger.info("Launching browser for scraping...")
-
-            browser = p.chromium.launch(headless=True) 
-            page = browser.new_page()
-
-            # Homepage
-            page.goto(url)
-            page.wait_for_timeout(2000)
-
-            # Retrieve the title
-            if page.locator("h1").count() == 0:
-                browser.close()
-                raise RuntimeError("No <h1> title found.")
-
-            title = page.locator("h1").first.inner_text().strip()
+    response = await client.get(url)
+    response.raise_for_status()
+    page = LexborHTMLParser(response.text)
 
-            # Content            
-            paragraphs = page.locator("article p").all_inner_texts()
-            content = "\n\n".join(p.strip() for p in paragraphs if p.strip())
+    # Retrieve the title
+    title_node = page.css_first("h1")
+    if title_node is None:
+        raise RuntimeError("No <h1> title found.")
 
-            if not content:
-                logger.warning("No article body found.")
+    title = title_node.text(strip=True)
 
-            # Published date
-            published_date = None
-            date_locator = page.locator("text=Stand:")
+    # Content
+    paragraphs = (p.text(strip=True) for p in page.css("article p"))
+    content = "\n\n".join(p for p in paragraphs if p)
 
-            if date_locator.count() > 0:
-                raw = date_locator.first.inner_text().replace("Stand:", "").replace("Uhr", "").strip()
+    if not content:
+        logger.warning("No article body found.")
 
-                published_date = datetime.strptime(
-                    raw.split()[0],
-                    "%d.%m.%Y"
-                ).date().isoformat()
+    # Published date
+    date_match = STAND_DATE_PATTERN.search(page.body.text() if page.body else "")
 
-            else:
-                published_date = datetime.now(timezone.utc).isoformat()
+    if date_match:
+        published_date = datetime.strptime(
+            date_match.group(1),
+            "%d.%m.%Y"
+        ).date()
 
-            browser.close()
+    else:
+        published_date = datetime.now(timezone.utc).date()
 
     return title, content, published_date
 
 
-def process_one_article_status(
+async def process_one_article_status(
+    pool: asyncpg.Pool,
     from_status: str,
     to_status: str,
     ) -> Optional[Dict[str, Any]]:
     """Atomically select and transition one article from one status to another.
 
     Args:
+        pool: asyncpg connection pool used to query the database.
         from_status: Current status value used to select an article.
         to_status: New status value assigned to the selected article
 
     Returns:
-        The original article row with updated status if successful, otherwise None.
+        The article row with updated status if one was claimed, otherwise None.
     """
-    rows = (
-        supabase
-        .table("deutsch")
-        .select("*")
-        .eq("status", from_status)
-        .limit(1)
-        .execute()
-    )
-
-    if not rows.data:
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            "SELECT * FROM claim_article($1, $2)",
+            from_status,
+            to_status,
+        )
+
+    if row is None:
         return None
 
-    article = rows.data[0]
+    return dict(row)
 
-    # lock it
-    lock = (
-        supabase.table("deutsch")
-        .update({"status": to_status})
-        .eq("id", article["id"])
-        .eq("status", from_status)
-        .execute()
-    )
 
-    if not lock.data:
-        return None
+async def claim_articles(
+    pool: asyncpg.Pool,
+    from_status: str,
+    to_status: str,
+    limit: int,
+    ) -> List[Dict[str, Any]]:
+    """Atomically select and transition up to `limit` articles from one status to another.
 
-    return article
+    Args:
+        pool: asyncpg connection pool used to query the database.
+        from_status: Current status value used to select the articles.
+        to_status: New status value assigned to the selected articles.
+        limit: Max number of articles to claim.
 
+    Returns:
+        The claimed article rows with updated status, empty if none are left.
+    """
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT * FROM claim_articles($1, $2, $3)",
+            limit,
+            from_status,
+            to_status,
+        )
 
-def scrape_all_new_articles() -> None:
-    """Scrapes and process all articles with the status `new`.
-    
-    Steps:
-    1. Continously fetches one article from db with `new` status
-    2. Scrapes the content using Playwright
-    3. Updates the scraped articles with relevant metadata
-    4. Marks article status as `scrapped` or `failed`
-    5. Process until now more `new` article is found.
+    return [dict(row) for row in rows]
+
+
+async def scrape_worker(
+    client: httpx.AsyncClient,
+    pool: asyncpg.Pool,
+    ) -> None:
+    """Claims and scrapes articles with the status `new` until none are left.
+
+    Args:
+        client: Shared httpx client used to fetch the article pages.
+        pool: asyncpg connection pool used to query the database.
     """
     while True:
-        article = process_one_article_status("new", "scraping")
+        article = await process_one_article_status(pool, "new", "scraping")
         if article is None:
-            logger.info("No more articles to scrape.")
             break
 
         try:
-            title, content, published_date = scrape_article(article["article_url"])
-
-            supabase.table("deutsch").update({
-                "title_de": title,
-                "content_de": content,
-                "published_date": published_date,
-                "status": "scrapped"
-            }).eq("id", article["id"]).execute()
+            title, content, published_date = await scrape_article(client, article["article_url"])
+
+            async with pool.acquire() as conn:
+                await conn.execute(
+                    "UPDATE deutsch SET title_de = $1, content_de = $2, "
+                    "published_date = $3::date, status = 'scrapped' WHERE id = $4",
+                    title,
+                    content,
+                    published_date,
+                    article["id"],
+                )
 
             logger.info(f"Scrapped {article["article_url"]}")
 
-        except (ValidationError, RuntimeError) as e:
-            logger.exception(f"LLM failure: {e}")
-            supabase.table("deutsch").update({
-                "status": "failed"
-            }).eq("id", article["id"]).execute()
+        # Any per-article error fails only that article, the other workers keep going
+        except Exception as e:
+            logger.exception(f"Scraping failure: {e}")
+            async with pool.acquire() as conn:
+                await conn.execute(
+                    "UPDATE deutsch SET status = 'failed' WHERE id = $1",
+                    article["id"],
+                )
 
             logger.info(f"Failed {article["article_url"]}: {e}")
 
 
+async def scrape_all_new_articles(
+    client: httpx.AsyncClient,
+    pool: asyncpg.Pool,
+    ) -> None:
+    """Scrapes and process all articles with the status `new`.
+    
+    Steps:
+    1. Starts `SCRAPE_WORKERS` concurrent workers, each of them:
+        - Continously claims one article from db with `new` status
+        - Scrapes the content using httpx and selectolax
+        - Updates the scraped articles with relevant metadata
+        - Marks article status as `scrapped` or `failed`
+    2. Process until now more `new` article is found.
+
+    Args:
+        client: Shared httpx client used to fetch the article pages.
+        pool: asyncpg connection pool used to query the database.
+    """
+    # A crashed worker must not close the pool under the others still running
+    results = await asyncio.gather(
+        *(scrape_worker(client, pool) for _ in range(SCRAPE_WORKERS)),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error("Scrape worker stopped", exc_info=result)
+
+    logger.info("No more articles to scrape.")
+
+
+async def main() -> None:
+    """Adds a new article and scrapes every pending one."""
+    pool = await create_pg_pool()
+
+    try:
+        # One client keeps the Tagesschau connection alive across all requests
+        async with httpx.AsyncClient(base_url=TAGESSCHAU_URL, follow_redirects=True) as client:
+            await add_new_article(client, pool)
+            await scrape_all_new_articles(client, pool)
+    finally:
+        await pool.close()
+
+
 if __name__ == "__main__":
-    add_new_article()
-    scrape_all_new_articles()
\ No newline at end of file
+    asyncio.run(main())
@@ -15,11 +15,11 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    supabase = context.bot_data["supabase"]
+    pool = context.bot_data["pg"]
 
     try:
         data = query.data
-        supabase = context.bot_data["supabase"]
+        pool = context.bot_data["pg"]
         chat_id = query.message.chat_id if query.message else query.from_user.id
 
     except (ValueError, KeyError, TypeError) as e:
@@ -31,31 +31,27 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         _, value, article_id = data.split(":")
         article_id = int(article_id)
 
-        row = (
-            supabase
-            .table("deutsch")
-            .select("title_en")
-            .eq("id", article_id)
-            .single()
-            .execute()
-        ).data
-
-        title = row["title_en"]
-
         if value == "up":
-            handle_thumbs_up(supabase, article_id)
-            await query.message.reply_text(f"<b>Saved:</b> {title}",
-                                           parse_mode="HTML")
+            title = await handle_thumbs_up(pool, article_id)
+            label = "Saved"
         else:
-            handle_thumbs_down(supabase, article_id)
-            await query.message.reply_text(f"<b>Not saved:</b> {title}",
-                                           parse_mode="HTML")
+            title = await handle_thumbs_down(pool, article_id)
+            label = "Not saved"
+
+        # Stale button or deleted article, no row was updated
+        if title is None:
+            logger.warning(f"Feedback for unknown article {article_id}")
+            await query.message.reply_text("Something went wrong. Please try again.")
+            return
+
+        await query.message.reply_text(f"<b>{label}:</b> {title}",
+                                       parse_mode="HTML")
 
     elif data == "recommend_more":
         await send_recommendations_on_demand(
             bot=context.bot,
             chat_id=chat_id,
-            supabase=supabase
+            pool=pool
         )
 
     else:
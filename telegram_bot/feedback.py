@@ -1,64 +1,98 @@
 """Script for handling telegram feedbacks."""
 
-from typing import Any
-from datetime import datetime, timezone
+import time
+from typing import Dict, Optional, Tuple
 
+import asyncpg
 
-def handle_thumbs_up(
-    supabase: Any,
+# Seconds an `has_enough_articles` result is reused before querying again
+HAS_ENOUGH_ARTICLES_TTL = 30
+
+# min_count -> (monotonic time of the check, result)
+_has_enough_articles_cache: Dict[int, Tuple[float, bool]] = {}
+
+
+async def handle_thumbs_up(
+    pool: asyncpg.Pool,
     article_id: int,
-    ) -> None:
+    ) -> Optional[str]:
     """Record positive user feedback for an article.
 
     Updates the db with feedback status to `up` and feedback time.
 
     Args:
-        supabase: Supabase client used to check article availability.
+        pool: asyncpg connection pool used to query the database.
         article_id: ID of the article.
+
+    Returns:
+        The English title of the article, or None if it does not exist.
     """
-    supabase.table("deutsch").update({
-        "feedback": "up",
-        "feedback_at": datetime.now(timezone.utc).isoformat(),
-    }).eq("id", article_id).execute()
+    async with pool.acquire() as conn:
+        return await conn.fetchval(
+            "UPDATE deutsch SET feedback = 'up', feedback_at = now() "
+            "WHERE id = $1 RETURNING title_en",
+            article_id,
+        )
 
 
-def handle_thumbs_down(
-    supabase: Any,
+async def handle_thumbs_down(
+    pool: asyncpg.Pool,
     article_id: int,
-    ) -> None:
+    ) -> Optional[str]:
     """Record negative user feedback for an article.
 
     Updates the db with feedback status to `down` and feedback time.
 
     Args:
-        supabase: Supabase client used to check article availability.
+        pool: asyncpg connection pool used to query the database.
         article_id: ID of the article.
+
+    Returns:
+        The English title of the article, or None if it does not exist.
     """
-    supabase.table("deutsch").update({
-        "feedback": "down",
-        "feedback_at": datetime.now(timezone.utc).isoformat(),
-        "active": False,
-    }).eq("id", article_id).execute()
+    async with pool.acquire() as conn:
+        title = await conn.fetchval(
+            "UPDATE deutsch SET feedback = 'down', feedback_at = now(), active = false "
+            "WHERE id = $1 RETURNING title_en",
+            article_id,
+        )
 
+    # One less active article, the cached availability may be stale
+    _has_enough_articles_cache.clear()
 
-def has_enough_articles(
-    supabase: Any,
+    return title
+
+
+async def has_enough_articles(
+    pool: asyncpg.Pool,
     min_count: int,
     ) -> bool:
     """Checks if there are enough active articles in the database.
 
+    The result is cached in-process for `HAS_ENOUGH_ARTICLES_TTL` seconds.
+
     Args:
-        supabase: Supabase client used to check article availability.
+        pool: asyncpg connection pool used to query the database.
         min_count: The minimum number of active articles in db.
 
     Returns:
         True if enough active articles, otherwise False.
     """
-    result = (
-        supabase
-        .table("deutsch")
-        .select("id", count="exact")
-        .eq("active", True)
-        .execute()
-    )
-    return (result.count or 0) >= min_count
\ No newline at end of file
+    now = time.monotonic()
+
+    cached = _has_enough_articles_cache.get(min_count)
+    if cached is not None and now - cached[0] < HAS_ENOUGH_ARTICLES_TTL:
+        return cached[1]
+
+    # Stop counting once `min_count` active articles were found
+    async with pool.acquire() as conn:
+        count = await conn.fetchval(
+            "SELECT count(*) FROM "
+            "(SELECT 1 FROM deutsch WHERE active = true LIMIT $1) AS active_articles",
+            min_count,
+        )
+
+    enough = (count or 0) >= min_count
+    _has_enough_articles_cache[min_count] = (now, enough)
+
+    return enough
@@ -2,16 +2,33 @@
 
 from typing import Dict, Any
 
-from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+import asyncpg
+from telegram import Bot
 from telegram_bot.feedback import has_enough_articles
 from recommend import get_recommendations
 
+# Pre-serialized inline keyboards, formatted with the article ID (twice).
+# PTB sends string parameters as-is, so no InlineKeyboardMarkup is built per message.
+FEEDBACK_KEYBOARD = (
+    '{"inline_keyboard":['
+    '[{"text":"Interested!","callback_data":"feedback:up:%d"},'
+    '{"text":"Not interested","callback_data":"feedback:down:%d"}]'
+    ']}'
+)
+FEEDBACK_RECOMMEND_KEYBOARD = (
+    '{"inline_keyboard":['
+    '[{"text":"Interested!","callback_data":"feedback:up:%d"},'
+    '{"text":"Not interested","callback_data":"feedback:down:%d"}],'
+    '[{"text":"More recommendations","callback_data":"recommend_more"}]'
+    ']}'
+)
+
 
 async def send_article_notification(
     bot: Bot,
     chat_id: int,
     article: Dict[str, Any],
-    supabase: Any
+    pool: asyncpg.Pool
     ) -> None:
     """Send an article notification message with feedback actions.
 
@@ -23,33 +40,19 @@ async def send_article_notification(
         bot: Telegram Bot instance used to send the message.
         chat_id: Telegram chat ID where the message will be sent.
         article: Article data containing relevant metadata.
-        supabase: Supabase client used to check article availability.
+        pool: asyncpg connection pool used to check article availability.
     """
-    keyboard = [
-        [
-            InlineKeyboardButton(
-                "Interested!",
-                callback_data=f"feedback:up:{article['id']}"
-                ),
-            InlineKeyboardButton(
-                "Not interested",
-                callback_data=f"feedback:down:{article['id']}"
-                ),
-            ]
-    ]
-
-    if has_enough_articles(supabase, min_count=8):
-        keyboard.append([
-            InlineKeyboardButton(
-                "More recommendations",
-                callback_data="recommend_more"
-            )
-        ])
-        
+    article_id = article["id"]
+
+    if await has_enough_articles(pool, min_count=8):
+        reply_markup = FEEDBACK_RECOMMEND_KEYBOARD % (article_id, article_id)
+    else:
+        reply_markup = FEEDBACK_KEYBOARD % (article_id, article_id)
+
     await bot.send_message(
         chat_id=chat_id,
         text=format_article_message(article),
-        reply_markup=InlineKeyboardMarkup(keyboard),
+        reply_markup=reply_markup,
         parse_mode="HTML",
         disable_web_page_preview=True,
         
@@ -59,7 +62,7 @@ async def send_article_notification(
 async def send_recommendations_on_demand(
     bot: Bot,
     chat_id: int,
-    supabase: Any
+    pool: asyncpg.Pool
     ) -> None:
     """Send an article recommendation message with upon user requests.
 
@@ -69,9 +72,9 @@ async def send_recommendations_on_demand(
     Args:
         bot: Telegram Bot instance used to send the message.
         chat_id: Telegram chat ID where the message will be sent.
-        supabase: Supabase client used to check article availability.
+        pool: asyncpg connection pool used to check article availability.
     """
-    recs = get_recommendations(supabase, limit=2)
+    recs = await get_recommendations(pool, limit=2)
 
     if not recs:
         await bot.send_message(chat_id, "No new recommendations yet.")
@@ -1,20 +1,33 @@
 """Script for translating German to English article."""
 
 import os
+import time
+import random
 import asyncio
-from typing import Any, Dict
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+import asyncpg
+import httpx
+from anthropic import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncAnthropic,
+    AuthenticationError,
+    BadRequestError,
+    PermissionDeniedError,
+)
 from dotenv import load_dotenv
 from pydantic import BaseModel, ValidationError
-from pydantic_ai import Agent
-from pydantic_ai.models.anthropic import AnthropicModel
-from pydantic_ai.providers.anthropic import AnthropicProvider
 from telegram import Bot
+from telegram.request import HTTPXRequest
 
 import prompts
 from utils.logging import get_logger
 from telegram_bot.sender import send_article_notification
-from scrape import process_one_article_status
-from database.client import get_supabase_client
+from scrape import claim_articles
+from database.pool import create_pg_pool
 
 logger = get_logger(__name__)
 load_dotenv()
@@ -23,8 +36,41 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 
-bot = Bot(token=TELEGRAM_BOT_TOKEN)
-supabase = get_supabase_client()
+# Model of the standalone classifier, classification is a short task a smaller model handles
+CLASSIFIER_MODEL = os.getenv("CLASSIFIER_MODEL", "claude-haiku-4-5")
+
+# Translate and classify in one LLM call, set to "false" for the two-step pipeline
+COMBINED_TRANSLATION = os.getenv("COMBINED_TRANSLATION", "true").lower() == "true"
+
+# Days a cached LLM output can be reused
+LLM_CACHE_TTL_DAYS = 30
+
+# Articles claimed per batch and LLM pipelines allowed to run at once
+TRANSLATE_BATCH_SIZE = 8
+TRANSLATE_CONCURRENCY = 4
+
+# Telegram notifications allowed to be sent at once
+NOTIFY_CONCURRENCY = 20
+
+# Name of the forced tool call carrying the structured LLM output
+OUTPUT_TOOL_NAME = "emit"
+
+# Batches failing only on transient LLM errors back off exponentially (capped),
+# after this many in a row the worker stops instead of draining the queue
+MAX_BACKOFF_SECONDS = 60
+MAX_CONSECUTIVE_FAILURES = 5
+
+# One keep-alive HTTP/2 connection pool for every Anthropic call of the run
+http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    timeout=httpx.Timeout(300, connect=10),
+)
+
+bot = Bot(
+    token=TELEGRAM_BOT_TOKEN,
+    request=HTTPXRequest(connection_pool_size=32, http_version="2"),
+)
 
 class Translation(BaseModel):
     title_en: str
@@ -38,46 +84,272 @@ class Classification(BaseModel):
     urgency: str
 
 
-model = AnthropicModel(
-    "claude-sonnet-4-5",
-    provider=AnthropicProvider(api_key=ANTHROPIC_API_KEY)
+class TranslatedClassified(BaseModel):
+    title_en: str
+    content_en: str
+    summary_en: str
+    topic: str
+    sentiment: str
+    urgency: str
+
+
+OutputT = TypeVar("OutputT", bound=BaseModel)
+
+
+class MissingOutputError(RuntimeError):
+    """Raised when the model answers without calling the output tool."""
+
+
+@dataclass(frozen=True)
+class StructuredAgent(Generic[OutputT]):
+    """One-shot Anthropic call returning a validated structured output.
+
+    The output is requested through a single forced tool call whose input
+        schema is the output model's JSON schema.
+    """
+    model: str
+    system_prompt: str
+    output_type: Type[OutputT]
+    max_tokens: int
+
+    @cached_property
+    def tool(self) -> Dict[str, Any]:
+        return {
+            "name": OUTPUT_TOOL_NAME,
+            "description": f"Return the {self.output_type.__name__} output.",
+            "input_schema": self.output_type.model_json_schema(),
+        }
+
+
+# LLM cache key -> output of the identical agent call currently running in this process
+inflight_llm_calls: Dict[str, asyncio.Future] = {}
+
+
+anthropic_client = AsyncAnthropic(
+    api_key=ANTHROPIC_API_KEY,
+    http_client=http_client,
+    timeout=http_client.timeout,
 )
 
-translator = Agent(
-    model=model,
+# Temperature 0 keeps outputs deterministic, max_tokens caps the generation time
+translator = StructuredAgent(
+    model="claude-sonnet-4-5",
+    system_prompt=prompts.TRANSLATOR_AGENT_PROMPT,
     output_type=Translation,
-    system_prompt=prompts.TRANSLATOR_AGENT_PROMPT
+    max_tokens=4096,
     )
 
-classifier = Agent(
-    model=model,
+classifier = StructuredAgent(
+    model=CLASSIFIER_MODEL,
+    system_prompt=prompts.CLASSIFICATION_AGENT_PROMPT,
     output_type=Classification,
-    system_prompt=prompts.CLASSIFICATION_AGENT_PROMPT
+    max_tokens=128,
+    )
+
+combined = StructuredAgent(
+    model="claude-sonnet-4-5",
+    system_prompt=prompts.COMBINED_AGENT_PROMPT,
+    output_type=TranslatedClassified,
+    max_tokens=4096 + 128,
+    )
+
+
+async def run_agent(
+    agent: StructuredAgent[OutputT],
+    prompt: str,
+    ) -> OutputT:
+    """Make a single Anthropic request and validate its structured output.
+
+    The system prompt is marked with cache_control. The tool schema and
+        system prompt are only ~220-390 tokens, below Anthropic's minimum
+        cacheable prefix (1024 tokens on Sonnet), so the marker has no effect
+        until the prompts grow past it.
+
+    Args:
+        agent: The agent to run.
+        prompt: The user prompt sent to the agent.
+
+    Returns:
+        The validated agent output.
+
+    Raises:
+        MissingOutputError: If the model did not call the output tool.
+    """
+    response = await anthropic_client.messages.create(
+        model=agent.model,
+        max_tokens=agent.max_tokens,
+        temperature=0.0,
+        system=[{
+            "type": "text",
+            "text": agent.system_prompt,
+            "cache_control": {"type": "ephemeral"},
+        }],
+        messages=[{"role": "user", "content": prompt}],
+        tools=[agent.tool],
+        tool_choice={"type": "tool", "name": OUTPUT_TOOL_NAME},
+    )
+
+    for block in response.content:
+        if block.type == "tool_use" and block.name == OUTPUT_TOOL_NAME:
+            return agent.output_type.model_validate(block.input)
+
+    raise MissingOutputError(
+        f"No {agent.output_type.__name__} output returned (stop reason: {response.stop_reason})."
     )
 
 
+def llm_cache_key(
+    agent: StructuredAgent,
+    prompt: str,
+    ) -> str:
+    """Build the LLM cache key of an agent call.
+
+    Whitespace in the prompt is collapsed so re-runs and wire-service reprints
+        that only differ in formatting map to the same key.
+
+    Args:
+        agent: The agent about to be run.
+        prompt: The user prompt sent to the agent.
+
+    Returns:
+        The hex SHA-256 digest of the model, output type, prompt version and
+            normalized prompt.
+    """
+    raw = "|".join([
+        agent.model,
+        agent.output_type.__name__,
+        prompts.PROMPT_VERSION,
+        " ".join(prompt.split()),
+    ])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+async def run_cached(
+    pool: asyncpg.Pool,
+    agent: StructuredAgent[OutputT],
+    prompt: str,
+    ) -> OutputT:
+    """Run an agent, reusing a previous output of the exact same call if cached.
+
+    Only validated outputs are cached, so retries after a failed step and
+        duplicated articles skip the LLM calls that already succeeded.
+        Identical calls made while one is still running wait for its output
+        instead of issuing a second LLM request.
+
+    Args:
+        pool: asyncpg connection pool used to query the database.
+        agent: The agent to run.
+        prompt: The user prompt sent to the agent.
+
+    Returns:
+        The agent output, either cached or freshly generated.
+    """
+    key = llm_cache_key(agent, prompt)
+
+    inflight = inflight_llm_calls.get(key)
+    if inflight is not None:
+        logger.info(f"Waiting for identical in-flight {agent.output_type.__name__} call.")
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    inflight_llm_calls[key] = future
+
+    try:
+        output = await run_with_llm_cache(pool, agent, prompt, key)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved in case no duplicate is waiting
+        future.exception()
+        raise
+    else:
+        future.set_result(output)
+        return output
+    finally:
+        del inflight_llm_calls[key]
+
+
+async def run_with_llm_cache(
+    pool: asyncpg.Pool,
+    agent: StructuredAgent[OutputT],
+    prompt: str,
+    key: str,
+    ) -> OutputT:
+    """Return the cached output of an agent call, running the agent on a miss.
+
+    Cache errors are logged and treated as a miss, so they never discard
+        an LLM output.
+
+    Args:
+        pool: asyncpg connection pool used to query the database.
+        agent: The agent to run.
+        prompt: The user prompt sent to the agent.
+        key: LLM cache key of the call.
+
+    Returns:
+        The agent output, either cached or freshly generated.
+    """
+    # The cache is best-effort, a failing lookup or write never fails the call
+    try:
+        async with pool.acquire() as conn:
+            cached = await conn.fetchval(
+                "SELECT output FROM llm_cache "
+                "WHERE key = $1 AND created_at > now() - make_interval(days => $2)",
+                key,
+                LLM_CACHE_TTL_DAYS,
+            )
+
+        if cached is not None:
+            output = agent.output_type.model_validate_json(cached)
+            logger.info(f"Reusing cached {agent.output_type.__name__} output.")
+            return output
+
+    except Exception as e:
+        logger.warning(f"LLM cache lookup failed, calling the model: {e}")
+
+    output = await run_agent(agent, prompt)
+
+    try:
+        async with pool.acquire() as conn:
+            await conn.execute(
+                "INSERT INTO llm_cache (key, output) VALUES ($1, $2::jsonb) "
+                "ON CONFLICT (key) DO UPDATE "
+                "SET output = EXCLUDED.output, created_at = now()",
+                key,
+                output.model_dump_json(),
+            )
+
+    except Exception as e:
+        logger.warning(f"LLM cache write failed: {e}")
+
+    return output
+
+
 async def translate_and_summarize(
     title_de: str,
     content_de: str,
+    pool: asyncpg.Pool,
     ) -> Translation:
     """Translates a German news article into English and generate a short summary.
 
     Args:
         title_de: Original German article title.
         content_de: Original German article content.
+        pool: asyncpg connection pool used by the LLM cache.
 
     Returns:
         The English title, translated content and a short English summary.
     """
-    prompt = prompts.TRANSLATOR_PROMPT.format(
-        title_de=title_de,
-        content_de=content_de
-    )
-    run = await translator.run(prompt)
-    return run.output
+    prompt = prompts.translator_prompt(title_de, content_de)
+    return await run_cached(pool, translator, prompt)
 
 
-async def translate_step(article: Dict[str, Any]) -> Translation:
+async def translate_step(
+    article: Dict[str, Any],
+    pool: asyncpg.Pool,
+    ) -> Translation:
     """Translate and summarize a scraped German article.
 
     A thin wrapper around `translate_and_summarize` that extracts
@@ -85,6 +357,7 @@ async def translate_step(article: Dict[str, Any]) -> Translation:
 
     Args:
         article: Article record containing `title_en` and `content_de` fields.
+        pool: asyncpg connection pool used by the LLM cache.
 
     Returns:
         Translated article and summary in English.
@@ -92,31 +365,33 @@ async def translate_step(article: Dict[str, Any]) -> Translation:
     return await translate_and_summarize(
         article["title_de"],
         article["content_de"],
+        pool,
     )
 
 
 async def classify_article(
     title_en: str,
     content_en: str,
+    pool: asyncpg.Pool,
     ) -> Classification:
     """Classifies a German news article with topic, sentiment and urgency.
 
     Args:
         title_en: Translated English article title.
         content_en: Translated English article content.
+        pool: asyncpg connection pool used by the LLM cache.
 
     Returns:
         The classified topic, sentiment and urgency values based on article content.
     """
-    prompt = prompts.CLASSIFICATION_PROMPT.format(
-        title_en=title_en,
-        content_en=content_en
-    )
-    run = await classifier.run(prompt)
-    return run.output
+    prompt = prompts.classification_prompt(title_en, content_en)
+    return await run_cached(pool, classifier, prompt)
 
 
-async def classify_step(translation: Translation) -> Classification:
+async def classify_step(
+    translation: Translation,
+    pool: asyncpg.Pool,
+    ) -> Classification:
     """Classifies the translated article into categories.
 
     A thin wrapper around `classify_article` that extracts
@@ -124,6 +399,7 @@ async def classify_step(translation: Translation) -> Classification:
 
     Args:
         translation: The translated article and summary in English.
+        pool: asyncpg connection pool used by the LLM cache.
 
     Returns:
         Classified article in English.
@@ -131,71 +407,364 @@ async def classify_step(translation: Translation) -> Classification:
     return await classify_article(
         translation.title_en,
         translation.content_en,
+        pool,
     )
 
 
-def save_translation_and_classification(
-    article_id: int,
-    translation: Translation,
-    classification: Classification,
-    ) -> None:
-    """Updates the database with translated article's metadata.
+async def translate_and_classify(
+    title_de: str,
+    content_de: str,
+    pool: asyncpg.Pool,
+    ) -> TranslatedClassified:
+    """Translates, summarizes and classifies a German news article in one LLM call.
 
     Args:
-        article_id: The article ID being translated and classified.
-        translation: The English title, translated content and a short English summary.
-        classification: The classified topic, sentiment and urgency values based on article content.
+        title_de: Original German article title.
+        content_de: Original German article content.
+        pool: asyncpg connection pool used by the LLM cache.
+
+    Returns:
+        The English title, translated content, a short English summary and
+            the classified topic, sentiment and urgency values.
     """
-    supabase.table("deutsch").update({
-        "title_en": translation.title_en,
-            "content_en": translation.content_en,
-            "summary_en": translation.summary_en,
-            "topic": classification.topic,
-            "sentiment": classification.sentiment,
-            "urgency": classification.urgency,
-            "status": "translated",
-        }).eq("id", article_id).execute() 
+    # Same user prompt as the translator, the output type keeps the cache keys apart
+    prompt = prompts.translator_prompt(title_de, content_de)
+    return await run_cached(pool, combined, prompt)
 
 
-async def process_steps() -> None:
-    """Process scraped articles through translation, classification and notification."""
+async def translate_classify_step(
+    article: Dict[str, Any],
+    pool: asyncpg.Pool,
+    ) -> TranslatedClassified:
+    """Translate, summarize and classify a scraped German article.
+
+    Uses the single combined LLM call unless `COMBINED_TRANSLATION` is disabled,
+        in which case it falls back to `translate_step` then `classify_step`.
+
+    Args:
+        article: Article record containing `title_de` and `content_de` fields.
+        pool: asyncpg connection pool used by the LLM cache.
+
+    Returns:
+        Translated, summarized and classified article in English.
+    """
+    if COMBINED_TRANSLATION:
+        return await translate_and_classify(
+            article["title_de"],
+            article["content_de"],
+            pool,
+        )
+
+    translation = await translate_step(article, pool)
+    classification = await classify_step(translation, pool)
+
+    return TranslatedClassified(
+        **translation.model_dump(),
+        **classification.model_dump(),
+    )
+
+
+async def save_translations_and_classifications(
+    pool: asyncpg.Pool,
+    results: Dict[int, TranslatedClassified],
+    ) -> List[Dict[str, Any]]:
+    """Updates the database with a batch of translated articles' metadata.
+
+    All articles are written with a single UPDATE, which also returns the
+        fields needed for the Telegram notification.
+
+    Args:
+        pool: asyncpg connection pool used to query the database.
+        results: Article IDs mapped to their English title, translated content,
+            short English summary and classified topic, sentiment and urgency.
+
+    Returns:
+        The updated article rows.
+    """
+    if not results:
+        return []
+
+    ids = list(results)
+    values = list(results.values())
+
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            UPDATE deutsch AS d
+            SET
+                title_en = r.title_en,
+                content_en = r.content_en,
+                summary_en = r.summary_en,
+                topic = r.topic,
+                sentiment = r.sentiment,
+                urgency = r.urgency,
+                status = 'translated'
+            FROM unnest(
+                $1::bigint[], $2::text[], $3::text[], $4::text[],
+                $5::text[], $6::text[], $7::text[]
+            ) AS r(id, title_en, content_en, summary_en, topic, sentiment, urgency)
+            WHERE d.id = r.id
+            RETURNING
+                d.id, d.article_url, d.title_en, d.summary_en,
+                d.topic, d.sentiment, d.urgency, d.category
+            """,
+            ids,
+            [v.title_en for v in values],
+            [v.content_en for v in values],
+            [v.summary_en for v in values],
+            [v.topic for v in values],
+            [v.sentiment for v in values],
+            [v.urgency for v in values],
+        )
+
+    return [dict(row) for row in rows]
+
+
+def is_transient_failure(error: BaseException) -> bool:
+    """Check if an LLM failure is caused by the provider rather than the article.
+
+    Args:
+        error: The exception raised by the LLM call.
 
-    while True:
-        article = process_one_article_status("scrapped", "translating")
-        if not article:
-            break
+    Returns:
+        True for rate limits, overloaded/server errors and connection errors.
+    """
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
 
-        logger.info("Translating and classifying article...")
-        try:
-            translation = await translate_step(article)
-            classification = await classify_step(translation)
-            save_translation_and_classification(article["id"], translation, classification)
+    return isinstance(error, APIConnectionError)
 
-            logger.info("Article updated and saved in db.")
 
-            row = (
-                supabase.table("deutsch")
-                .select("id, article_url, title_en, summary_en, topic, sentiment, urgency, category")
-                .eq("id", article["id"])
-                .single()
-                .execute()
-            ).data
+def is_fatal_failure(error: BaseException) -> bool:
+    """Check if an LLM failure means no further request can succeed.
 
+    Args:
+        error: The exception raised by the LLM call.
+
+    Returns:
+        True for an invalid API key, missing permissions or a too low credit
+            balance. Other rejected requests only concern their article.
+    """
+    if isinstance(error, BadRequestError):
+        return "credit balance" in str(error).lower()
+
+    return isinstance(error, (AuthenticationError, PermissionDeniedError))
+
+
+async def translate_article(
+    article: Dict[str, Any],
+    pool: asyncpg.Pool,
+    ) -> Optional[TranslatedClassified]:
+    """Translate and classify a single claimed article.
+
+    Articles whose LLM output is missing or invalid, or whose request is
+        rejected (e.g. prompt too long), are marked as `failed`. Any other
+        error is re-raised, the caller releases the article.
+
+    Args:
+        article: Article record claimed with the `translating` status.
+        pool: asyncpg connection pool used to query the database.
+
+    Returns:
+        The translation/classification result, or None if the article failed.
+    """
+    try:
+        return await translate_classify_step(article, pool)
+
+    except (ValidationError, MissingOutputError, BadRequestError) as e:
+        if is_fatal_failure(e):
+            raise
+
+        logger.exception(f"LLM failure: {e}")
+        async with pool.acquire() as conn:
+            await conn.execute(
+                "UPDATE deutsch SET status = 'failed' WHERE id = $1",
+                article["id"],
+            )
+
+        return None
+
+
+def log_notification_failure(task: asyncio.Task) -> None:
+    """Log the exception of a failed notification task.
+
+    Args:
+        task: The finished notification task.
+    """
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Telegram notification failed", exc_info=task.exception())
+
+
+async def release_articles(
+    pool: asyncpg.Pool,
+    articles: List[Dict[str, Any]],
+    ) -> None:
+    """Put claimed but unprocessed articles back to the `scrapped` status.
+
+    Args:
+        pool: asyncpg connection pool used to query the database.
+        articles: Article records claimed with the `translating` status.
+    """
+    if not articles:
+        return
+
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "UPDATE deutsch SET status = 'scrapped' "
+            "WHERE id = ANY($1::bigint[]) AND status = 'translating'",
+            [article["id"] for article in articles],
+        )
+
+
+async def process_steps() -> None:
+    """Process scraped articles through translation, classification and notification.
+
+    Articles are claimed in batches of `TRANSLATE_BATCH_SIZE` and translated
+        concurrently, with at most `TRANSLATE_CONCURRENCY` in flight. The
+        next batch is claimed while the current one is being translated.
+        Each batch is then saved in one query and notified to Telegram in the
+        background, while the next batch is being translated.
+
+    Articles failing on transient LLM or unexpected errors are released back
+        to the queue, and batches failing only on them are retried after an exponential
+        backoff with jitter. The worker stops with a RuntimeError after
+        `MAX_CONSECUTIVE_FAILURES` of them in a row, or on a fatal LLM error
+        once the batch's successful results are saved and notified.
+    """
+    pool = await create_pg_pool()
+    semaphore = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+    notify_semaphore = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+    notify_tasks: List[asyncio.Task] = []
+    # article ID -> step durations in ms, logged once the article is notified
+    timings: Dict[int, Dict[str, float]] = {}
+
+    async def translate_bounded(article: Dict[str, Any]) -> Optional[TranslatedClassified]:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                return await translate_article(article, pool)
+            finally:
+                timings[article["id"]] = {
+                    "translate_ms": (time.perf_counter() - start) * 1000,
+                }
+
+    async def notify_bounded(row: Dict[str, Any]) -> None:
+        timing = timings.pop(row["id"], {})
+        async with notify_semaphore:
+            start = time.perf_counter()
             await send_article_notification(
                 bot=bot,
                 chat_id=TELEGRAM_CHAT_ID,
                 article=row,
-                supabase=supabase
+                pool=pool
             )
 
-            logger.info(f"Notified to telegram user: {article['article_url']}")
+        timing["notify_ms"] = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"article_done id={row['id']} "
+            + " ".join(f"{step}={ms:.0f}" for step, ms in timing.items())
+            + f" url={row['article_url']}"
+        )
+
+    consecutive_failures = 0
+    next_claim: Optional[asyncio.Task] = asyncio.create_task(
+        claim_articles(pool, "scrapped", "translating", TRANSLATE_BATCH_SIZE)
+    )
+
+    try:
+        # Opens the bot's HTTP/2 request pool, so shutdown() below closes it
+        await bot.initialize()
+
+        while True:
+            batch = await next_claim
+            next_claim = None
+            if not batch:
+                break
+
+            translations = asyncio.gather(
+                *(translate_bounded(article) for article in batch),
+                return_exceptions=True,
+            )
+
+            # Claim the next batch while this one is being translated
+            next_claim = asyncio.create_task(
+                claim_articles(pool, "scrapped", "translating", TRANSLATE_BATCH_SIZE)
+            )
 
-        except (ValidationError, RuntimeError) as e:
-            logger.exception(f"LLM failure: {e}")
-            supabase.table("deutsch").update({
-                "status": "failed"
-            }).eq("id", article["id"]).execute()
+            results = await translations
+
+            translated: Dict[int, TranslatedClassified] = {}
+            released: List[Dict[str, Any]] = []
+            fatal_error: Optional[BaseException] = None
+            for article, result in zip(batch, results):
+                # BaseException, a dedupe waiter can end with CancelledError
+                if isinstance(result, BaseException) and is_transient_failure(result):
+                    logger.warning(f"Transient LLM failure for {article['article_url']}: {result}")
+                    released.append(article)
+                elif isinstance(result, BaseException) and is_fatal_failure(result):
+                    fatal_error = result
+                    released.append(article)
+                elif isinstance(result, BaseException):
+                    # e.g. a database error, retried like a transient failure
+                    logger.error(
+                        f"Unexpected failure for {article['article_url']}",
+                        exc_info=result,
+                    )
+                    released.append(article)
+                elif result is not None:
+                    translated[article["id"]] = result
+                    continue
+
+                timings.pop(article["id"], None)
+
+            await release_articles(pool, released)
+
+            if translated:
+                consecutive_failures = 0
+            elif released and fatal_error is None:
+                consecutive_failures += 1
+                if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                    raise RuntimeError(
+                        f"Translation failed {consecutive_failures} batches in a row, stopping."
+                    )
+
+                delay = min(MAX_BACKOFF_SECONDS, 2 ** consecutive_failures) + random.random()
+                logger.warning(f"Backing off {delay:.1f}s after {consecutive_failures} failed batches.")
+                await asyncio.sleep(delay)
+                continue
+
+            start = time.perf_counter()
+            try:
+                rows = await save_translations_and_classifications(pool, translated)
+            except Exception:
+                # Only rows still in `translating` are released, outputs are in the LLM cache
+                await release_articles(pool, batch)
+                raise
+            save_ms = (time.perf_counter() - start) * 1000
+
+            for row in rows:
+                timings.setdefault(row["id"], {})["save_ms"] = save_ms
+                task = asyncio.create_task(notify_bounded(row))
+                task.add_done_callback(log_notification_failure)
+                notify_tasks.append(task)
+
+            # Successful results of the batch are saved above, pending ones notify in `finally`
+            if fatal_error is not None:
+                raise RuntimeError("LLM provider rejected the request, stopping.") from fatal_error
+    finally:
+        # A batch claimed ahead but never processed goes back to the queue
+        if next_claim is not None:
+            try:
+                await release_articles(pool, await next_claim)
+            except Exception:
+                logger.exception("Failed to release pre-claimed articles")
+
+        # Notifications still need the pool for the availability check
+        await asyncio.gather(*notify_tasks, return_exceptions=True)
+        await bot.shutdown()
+        await pool.close()
+        await http_client.aclose()
 
 
 if __name__ == "__main__":
-    asyncio.run(process_steps())
\ No newline at end of file
+    asyncio.run(process_steps())